@@ -4,60 +4,105 @@ Move any files in Templates_docx, Templates_markdown, or Templates_txt that are
 not listed in reports_index.json into backup/, preserving folder structure.
 """
 
+import errno
 import json
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Iterable, Set
+from typing import Dict, FrozenSet
+
+from python_src.fs_utils import iter_ext
+
+try:
+    import orjson
+except ImportError:  # optional, faster JSON decoding
+    orjson = None
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
+# Folder name -> file suffix to consider.
 TARGETS: Dict[str, str] = {
-    "Templates_docx": "*.docx",
-    "Templates_markdown": "*.md",
-    "Templates_txt": "*.txt",
+    "Templates_docx": ".docx",
+    "Templates_markdown": ".md",
+    "Templates_txt": ".txt",
 }
 INDEX_PATH = REPO_ROOT / "reports_index.json"
 BACKUP_DIR = REPO_ROOT / "backup"
 
 
-def load_index() -> Dict[str, Set[str]]:
+def load_index() -> Dict[str, FrozenSet[bytes]]:
+    """Return the indexed relative paths per folder, filesystem-encoded.
+
+    Encoding the (few) index entries once lets move_unindexed list folders as
+    bytes and compare without decoding every directory entry.
+    """
     if not INDEX_PATH.exists():
         raise SystemExit("Index file not found. Run generate_index.py first.")
 
-    data = json.loads(INDEX_PATH.read_text(encoding="utf-8"))
-    indexed: Dict[str, Set[str]] = {}
+    raw = INDEX_PATH.read_bytes()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    indexed: Dict[str, FrozenSet[bytes]] = {}
     for folder_name in TARGETS.keys():
-        indexed[folder_name] = set(data.get(folder_name, []))
+        indexed[folder_name] = frozenset(map(os.fsencode, data.get(folder_name, [])))
     return indexed
 
 
-def iter_files(folder: Path, pattern: str) -> Iterable[Path]:
-    return (p for p in folder.glob(pattern) if p.is_file())
+def move_file(src: str, dest: Path) -> None:
+    """Rename src to dest, copying only when they live on different filesystems."""
+    try:
+        os.replace(src, dest)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        shutil.move(src, str(dest))
 
 
-def move_unindexed(indexed: Dict[str, Set[str]]) -> None:
+def backup_file(src: str, rel_path: str) -> bool:
+    """Move src to backup/rel_path; returns False if the destination already exists."""
+    dest = BACKUP_DIR / rel_path
+    if dest.exists():
+        return False
+    move_file(src, dest)
+    return True
+
+
+def move_unindexed(indexed: Dict[str, FrozenSet[bytes]]) -> None:
     BACKUP_DIR.mkdir(exist_ok=True)
+    # Listed paths all start with the repo root; slice it off to get the
+    # relative path used in the index.
+    root_len = len(os.fsencode(REPO_ROOT) + os.fsencode(os.sep))
     moved = 0
-    for folder_name, pattern in TARGETS.items():
+    for folder_name, suffix in TARGETS.items():
         folder = REPO_ROOT / folder_name
         if not folder.exists():
             print(f"Skipping missing folder: {folder}")
             continue
 
-        expected = indexed.get(folder_name, set())
-        for path in iter_files(folder, pattern):
-            rel_path = str(path.relative_to(REPO_ROOT))
-            if rel_path in expected:
-                continue
-
-            dest = BACKUP_DIR / rel_path
-            dest.parent.mkdir(parents=True, exist_ok=True)
-            if dest.exists():
-                print(f"Skip {rel_path}: destination already exists in backup.")
-                continue
-
-            shutil.move(str(path), str(dest))
-            moved += 1
-            print(f"Moved {rel_path} -> {dest.relative_to(REPO_ROOT)}")
+        expected = indexed.get(folder_name, frozenset())
+        # Materialize the listing (relative path -> path) before moving entries
+        # out of the folder, then keep only what the index does not list. The
+        # listing stays in bytes; only files to move are decoded.
+        found = {
+            path[root_len:]: path
+            for path in iter_ext(os.fsencode(folder), os.fsencode(suffix))
+        }
+        to_move = sorted(found.keys() - expected)
+        if not to_move:
+            continue
+        rel_paths = [os.fsdecode(rel) for rel in to_move]
+        sources = [os.fsdecode(found[rel]) for rel in to_move]
+
+        # Entries are direct children of the folder, so one mkdir covers them all.
+        (BACKUP_DIR / folder_name).mkdir(parents=True, exist_ok=True)
+        # Same-filesystem moves are single rename syscalls; overlap them.
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = executor.map(backup_file, sources, rel_paths)
+            for rel_path, was_moved in zip(rel_paths, results):
+                if not was_moved:
+                    print(f"Skip {rel_path}: destination already exists in backup.")
+                    continue
+                moved += 1
+                print(f"Moved {rel_path} -> {Path('backup', rel_path)}")
 
     print(f"\nDone. Files moved: {moved}")
 
@@ -1,3 +1,9 @@
+import copy
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Tuple
 
@@ -12,6 +18,12 @@ LINE_SPACING = 1
 REPO_ROOT = Path(__file__).resolve().parent.parent
 SOURCE_DIR = REPO_ROOT / "Templates_markdown"
 TARGET_DIR = REPO_ROOT / "Templates_docx"
+PT_ZERO = Pt(0)
+PT_BODY = Pt(FONT_SIZE_PT)
+PT_SMALL = Pt(8)
+PT_CACHE = {FONT_SIZE_PT: PT_BODY, 8: PT_SMALL}
+# Emphasis markers, longest first so "**"/"__" win over "*"/"_".
+TOKEN_RE = re.compile(r"(\*\*|__|\*|_)")
 
 
 def configure_base_style(document: Document) -> None:
@@ -19,14 +31,27 @@ def configure_base_style(document: Document) -> None:
     style = document.styles["Normal"]
     font = style.font
     font.name = FONT_NAME
-    font.size = Pt(FONT_SIZE_PT)
+    font.size = PT_BODY
 
     paragraph_format = style.paragraph_format
-    paragraph_format.space_before = Pt(0)
-    paragraph_format.space_after = Pt(0)
+    paragraph_format.space_before = PT_ZERO
+    paragraph_format.space_after = PT_ZERO
     paragraph_format.line_spacing = LINE_SPACING
 
 
+@lru_cache(maxsize=None)
+def _template_document() -> Document:
+    """Return an empty document with the base style applied, built once per process."""
+    document = Document()
+    configure_base_style(document)
+    return document
+
+
+def new_document() -> Document:
+    """Return a fresh, styled empty document (a copy of the cached template)."""
+    return copy.deepcopy(_template_document())
+
+
 def append_run(
     paragraph,
     text: str,
@@ -42,7 +67,7 @@ def append_run(
     run.bold = bold
     run.italic = italic or force_italic
     run.font.name = FONT_NAME
-    run.font.size = Pt(font_size_pt)
+    run.font.size = PT_CACHE.get(font_size_pt) or Pt(font_size_pt)
 
 
 def normalize_heading(line: str) -> Tuple[str, bool]:
@@ -60,114 +85,102 @@ def add_markdown_paragraph(
     alignment: WD_ALIGN_PARAGRAPH,
     force_italic: bool = False,
     font_size_pt: int = FONT_SIZE_PT,
+    style="Normal",
 ) -> None:
-    """Convert a single markdown line into a DOCX paragraph."""
+    """Convert a single markdown line into a DOCX paragraph.
+
+    Spacing is inherited from the Normal style set up by configure_base_style.
+    """
     text, heading = normalize_heading(raw_line)
-    paragraph = document.add_paragraph(style="Normal")
+    paragraph = document.add_paragraph(style=style)
     paragraph.alignment = alignment
-    paragraph_format = paragraph.paragraph_format
-    paragraph_format.space_before = Pt(0)
-    paragraph_format.space_after = Pt(0)
-    paragraph_format.line_spacing = LINE_SPACING
 
     if text == "":
         paragraph.add_run("")
         return
 
-    buffer = []
     bold = heading
     italic = False
-    i = 0
-    while i < len(text):
-        if text.startswith("**", i):
-            append_run(
-                paragraph, "".join(buffer), bold, italic, force_italic, font_size_pt
-            )
-            buffer = []
-            bold = not bold
-            i += 2
-            continue
-        if text.startswith("__", i):
-            append_run(
-                paragraph, "".join(buffer), bold, italic, force_italic, font_size_pt
-            )
-            buffer = []
+    last = 0
+    for match in TOKEN_RE.finditer(text):
+        append_run(
+            paragraph, text[last:match.start()], bold, italic, force_italic, font_size_pt
+        )
+        if len(match.group(1)) == 2:
             bold = not bold
-            i += 2
-            continue
-        if text[i] == "*":
-            append_run(
-                paragraph, "".join(buffer), bold, italic, force_italic, font_size_pt
-            )
-            buffer = []
-            italic = not italic
-            i += 1
-            continue
-        if text[i] == "_":
-            append_run(
-                paragraph, "".join(buffer), bold, italic, force_italic, font_size_pt
-            )
-            buffer = []
+        else:
             italic = not italic
-            i += 1
-            continue
-
-        buffer.append(text[i])
-        i += 1
+        last = match.end()
 
     append_run(
-        paragraph, "".join(buffer), bold, italic, force_italic, font_size_pt
+        paragraph, text[last:], bold, italic, force_italic, font_size_pt
     )
 
 
-def convert_file(md_path: Path, output_path: Path) -> None:
-    """Convert a markdown file into a DOCX file."""
-    document = Document()
-    configure_base_style(document)
+def build_document(md_text: str) -> Document:
+    """Build the DOCX document for a markdown text."""
+    document = new_document()
+    normal_style = document.styles["Normal"]
 
-    lines = md_path.read_text(encoding="utf-8").splitlines()
+    lines = md_text.splitlines()
     if not lines:
-        document.add_paragraph("", style="Normal")
+        document.add_paragraph("", style=normal_style)
     else:
-        first_written = next((i for i, line in enumerate(lines) if line.strip()), None)
-        last_written = (
-            len(lines) - 1
-            - next((i for i, line in enumerate(reversed(lines)) if line.strip()), None)
-            if any(line.strip() for line in lines)
-            else None
-        )
-
-        for idx, line in enumerate(lines):
-            alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
-            force_italic = False
-            font_size_pt = FONT_SIZE_PT
-            if first_written is not None and idx == first_written:
-                alignment = WD_ALIGN_PARAGRAPH.CENTER
-            if last_written is not None and idx == last_written:
-                alignment = WD_ALIGN_PARAGRAPH.CENTER
-                force_italic = True
-                font_size_pt = 8
-
+        first_written = last_written = None
+        for i, line in enumerate(lines):
+            if line.strip():
+                if first_written is None:
+                    first_written = i
+                last_written = i
+
+        # (alignment, force_italic, font_size_pt) per line: body text is justified,
+        # first written line centered, last written line centered, italic and small.
+        specs = [(WD_ALIGN_PARAGRAPH.JUSTIFY, False, FONT_SIZE_PT)] * len(lines)
+        if first_written is not None:
+            specs[first_written] = (WD_ALIGN_PARAGRAPH.CENTER, False, FONT_SIZE_PT)
+            specs[last_written] = (WD_ALIGN_PARAGRAPH.CENTER, True, 8)
+
+        for line, (alignment, force_italic, font_size_pt) in zip(lines, specs):
             add_markdown_paragraph(
                 document,
                 line,
                 alignment=alignment,
                 force_italic=force_italic,
                 font_size_pt=font_size_pt,
+                style=normal_style,
             )
+    return document
 
+
+def md_to_docx_bytes(md_text: str) -> bytes:
+    """Convert a markdown text into the bytes of a .docx file, without touching disk."""
+    buffer = io.BytesIO()
+    build_document(md_text).save(buffer)
+    return buffer.getvalue()
+
+
+def convert_file(md_path: Path, output_path: Path) -> None:
+    """Convert a markdown file into a DOCX file."""
+    document = build_document(md_path.read_text(encoding="utf-8"))
     output_path.parent.mkdir(parents=True, exist_ok=True)
     document.save(output_path)
 
 
+def _convert_one(md_file: Path) -> None:
+    """Convert one markdown file into its DOCX counterpart in TARGET_DIR."""
+    output_file = TARGET_DIR / f"{md_file.stem}.docx"
+    convert_file(md_file, output_file)
+
+
 def main() -> None:
     if not SOURCE_DIR.exists():
         raise FileNotFoundError(f"Source folder not found: {SOURCE_DIR}")
 
     TARGET_DIR.mkdir(parents=True, exist_ok=True)
-    for md_file in sorted(SOURCE_DIR.glob("*.md")):
-        output_file = TARGET_DIR / f"{md_file.stem}.docx"
-        convert_file(md_file, output_file)
+    md_files = sorted(SOURCE_DIR.glob("*.md"))
+    # Files are independent and python-docx is pure-Python (GIL-bound), so use processes.
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(_convert_one, md_files, chunksize=4))
 
 
 if __name__ == "__main__":
@@ -3,8 +3,11 @@
 Script to convert .docx and .rtf files to Markdown while preserving formatting.
 """
 
+import io
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 import re
 
@@ -24,217 +27,267 @@ except ImportError:
     os.system(f"{sys.executable} -m pip install striprtf")
     from striprtf.striprtf import rtf_to_text
 
+# RTF cleanup patterns, compiled once and reused for every line.
+_CTRL_RE = re.compile(r'[\x00-\x1f\x7f-\x9f]')
+_WS_RE = re.compile(r'\s+')
+_FONT_NAMES = frozenset({
+    'times new roman', 'arial', 'calibri', 'helvetica', 'trebuchet ms', 'cambria', 'times',
+})
+# Lines that are only stray words or numbers.
+_DISCARD_RE = re.compile(r'^(?:[a-z\s]+\}?|[\d\s\-]+)$', re.IGNORECASE)
+# Section keywords, lowercase to match against the lowered line.
+_KEYWORDS = ('indicação clínica', 'técnica do exame', 'aspectos observados', 'impressão')
+_SECTION_STARTS = ('INDICAÇÃO', 'TÉCNICA', 'ASPECTOS', 'IMPRESSÃO')
+_FOOTNOTE_WORDS = ('probabilidade', 'médico', 'diagnóstica')
 
-def convert_docx_to_markdown(docx_path):
-    """Convert a .docx file to Markdown preserving formatting."""
-    try:
-        doc = Document(docx_path)
-        markdown_lines = []
-        
-        for paragraph in doc.paragraphs:
-            if not paragraph.text.strip():
-                markdown_lines.append("")
-                continue
-            
+# Built-in DOCX paragraph style name (lowercased) -> Markdown heading level.
+_HEADING_LEVEL = {
+    'heading 1': 1,
+    'heading 2': 2,
+    'heading 3': 3,
+    'heading 4': 4,
+    'heading 5': 5,
+    'heading 6': 6,
+    'title': 1,
+}
+# Artifacts left by RTF commands, removed in this order (the same per-line
+# sequence the Rust converter applies, though its text extraction before that
+# step differs): each pattern only sees what the previous ones left, so "12 }"
+# keeps "12".
+_ARTIFACT_RES = tuple(re.compile(p) for p in (
+    r'^[a-z]+\s+[a-z]+\s+',  # stray words at start
+    r'\s*\}\s*$',  # brace at end
+    r'^\s*\{\s*',  # brace at start
+    r'^\s*[\d\-]+\s+',  # stray number at start
+    r'\s+[\d\-]+\s*$',  # stray number at end
+))
+
+# Fallback patterns used when striprtf fails to parse the document.
+_RTF_CMD_RE = re.compile(r'\\[a-z]+\d*\s*')
+_RTF_ESC_BRACE_RE = re.compile(r'\\[{}]')
+_RTF_HEX_RE = re.compile(r"\\'[0-9a-f]{2}")
+_RTF_STRAY_NUM_RE = re.compile(r'\s+\d+\s+')
+
+
+def iter_docx_markdown(docx_path):
+    """Yield the Markdown lines of a .docx file, preserving formatting."""
+    doc = Document(docx_path)
+
+    for paragraph in doc.paragraphs:
+        plain_text = paragraph.text
+        if not plain_text.strip():
+            yield ""
+            continue
+
+        runs = paragraph.runs
+        if not any(run.bold or run.italic or run.underline for run in runs):
+            # Nothing to mark up: join the runs' text as is. paragraph.text would
+            # also include hyperlink text, which runs (and the Rust side) skip.
+            para_text = "".join(run.text for run in runs) or plain_text
+        else:
             # Process runs to preserve formatting
             text_parts = []
-            for run in paragraph.runs:
+            for run in runs:
                 text = run.text
                 if not text:
                     continue
 
-                # Apply formatting using pure Markdown (no HTML)
-                if run.bold:
-                    text = f"**{text}**"
-                if run.italic:
-                    text = f"*{text}*"
-                if run.underline:
-                    text = f"__{text}__"
+                # Apply formatting using pure Markdown (no HTML):
+                # bold innermost, then italic, then underline
+                bold, italic, underline = run.bold, run.italic, run.underline
+                pre = ("__" if underline else "") + ("*" if italic else "") + ("**" if bold else "")
+                post = ("**" if bold else "") + ("*" if italic else "") + ("__" if underline else "")
+                text_parts.append(f"{pre}{text}{post}")
 
-                text_parts.append(text)
-            
-            # If there are no formatted runs, fall back to the paragraph text
-            if not text_parts:
-                para_text = paragraph.text
-            else:
-                para_text = "".join(text_parts)
-            
-            # Inspect paragraph style (may be missing in some DOCX files)
-            style_name = getattr(getattr(paragraph, "style", None), "name", "") or ""
-            style = style_name.lower()
-            
-            # Headings
-            if 'heading' in style or 'title' in style:
-                level = 1
-                if 'heading 1' in style or 'title' in style:
-                    level = 1
-                elif 'heading 2' in style:
-                    level = 2
-                elif 'heading 3' in style:
-                    level = 3
-                elif 'heading 4' in style:
-                    level = 4
-                elif 'heading 5' in style:
-                    level = 5
-                elif 'heading 6' in style:
-                    level = 6
-                
-                markdown_lines.append(f"{'#' * level} {para_text}")
-            else:
-                markdown_lines.append(para_text)
-        
-        # Process tables
-        for table in doc.tables:
-            markdown_lines.append("")
-            # Header
-            header_row = table.rows[0]
-            header_cells = [cell.text.strip() for cell in header_row.cells]
-            markdown_lines.append("| " + " | ".join(header_cells) + " |")
-            markdown_lines.append("| " + " | ".join(["---"] * len(header_cells)) + " |")
-            
-            # Data rows
-            for row in table.rows[1:]:
-                cells = [cell.text.strip() for cell in row.cells]
-                markdown_lines.append("| " + " | ".join(cells) + " |")
-            markdown_lines.append("")
-        
-        return "\n".join(markdown_lines)
-    
+            # If no run carried text, fall back to the paragraph text
+            para_text = "".join(text_parts) or plain_text
+
+        # Inspect paragraph style (may be missing in some DOCX files)
+        style_name = getattr(getattr(paragraph, "style", None), "name", "") or ""
+        style = style_name.lower()
+
+        # Headings
+        level = _HEADING_LEVEL.get(style)
+        if level is not None:
+            yield f"{'#' * level} {para_text}"
+        else:
+            yield para_text
+
+    # Process tables
+    for table in doc.tables:
+        yield ""
+        # Header
+        header_row = table.rows[0]
+        header_cells = [cell.text.strip() for cell in header_row.cells]
+        yield "| " + " | ".join(header_cells) + " |"
+        yield "| " + " | ".join(["---"] * len(header_cells)) + " |"
+
+        # Data rows
+        for row in table.rows[1:]:
+            cells = [cell.text.strip() for cell in row.cells]
+            yield "| " + " | ".join(cells) + " |"
+        yield ""
+
+
+def _docx_error(docx_path, e):
+    return f"# Error converting {docx_path}\n\nError: {str(e)}"
+
+
+def convert_docx_to_markdown(docx_path):
+    """Convert a .docx file to Markdown preserving formatting."""
+    try:
+        return "\n".join(iter_docx_markdown(docx_path))
     except Exception as e:
-        return f"# Error converting {docx_path}\n\nError: {str(e)}"
+        return _docx_error(docx_path, e)
 
 
-def convert_rtf_to_markdown(rtf_path):
-    """Convert an .rtf file to Markdown preserving basic formatting."""
+def docx_bytes_to_md(data):
+    """Convert the bytes of a .docx file to Markdown, without touching disk."""
+    return "\n".join(iter_docx_markdown(io.BytesIO(data)))
+
+
+def _strip_rtf_groups(text):
+    """Drop every {...} group (nested or not) in a single left-to-right pass."""
+    out = []
+    depth = 0
+    for ch in text:
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth = max(0, depth - 1)
+        elif depth == 0:
+            out.append(ch)
+    return ''.join(out)
+
+
+def iter_rtf_markdown(rtf_path):
+    """Yield the Markdown lines of an .rtf file, preserving basic formatting."""
+    with open(rtf_path, 'rb') as f:
+        rtf_content = f.read()
+
+    # RTF is 7-bit ASCII with \'hh escapes, so latin-1 always decodes losslessly
+    rtf_text = rtf_content.decode('latin-1', errors='replace')
+
+    # Use striprtf to extract clean text
     try:
-        with open(rtf_path, 'rb') as f:
-            rtf_content = f.read()
-        
-        # Try different encodings
-        encodings = ['latin-1', 'cp1252', 'iso-8859-1', 'utf-8']
-        rtf_text = None
-        
-        for encoding in encodings:
-            try:
-                candidate = rtf_content.decode(encoding, errors='ignore')
-                parsed = rtf_to_text(candidate)
-                if parsed.strip():
-                    rtf_text = candidate
-                    break
-            except Exception:
-                continue
-        
-        if rtf_text is None:
-            rtf_text = rtf_content.decode('latin-1', errors='ignore')
-        
-        # Use striprtf to extract clean text
-        try:
-            plain_text = rtf_to_text(rtf_text)
-        except Exception as e:
-            # Fallback: basic manual extraction removing RTF commands
-            plain_text = rtf_text
-            # Remove empty RTF groups first
-            while '{' in plain_text and '}' in plain_text:
-                plain_text = re.sub(r'\{[^{}]*\}', '', plain_text)
-            # Remove RTF commands
-            plain_text = re.sub(r'\\[a-z]+\d*\s*', ' ', plain_text)
-            plain_text = re.sub(r'\\[{}]', '', plain_text)
-            # Remove RTF special characters
-            plain_text = re.sub(r'\\\'[0-9a-f]{2}', '', plain_text)
-            # Remove stray numbers that belong to RTF commands
-            plain_text = re.sub(r'\s+\d+\s+', ' ', plain_text)
-        
-        # Clean extracted text
-        # Remove lines that are only font names or commands
-        lines = plain_text.split('\n')
-        cleaned_lines = []
+        plain_text = rtf_to_text(rtf_text)
+    except Exception as e:
+        # Fallback: basic manual extraction removing RTF commands
+        plain_text = rtf_text
+        # Remove RTF groups first
+        plain_text = _strip_rtf_groups(plain_text)
+        # Remove RTF commands
+        plain_text = _RTF_CMD_RE.sub(' ', plain_text)
+        plain_text = _RTF_ESC_BRACE_RE.sub('', plain_text)
+        # Remove RTF special characters
+        plain_text = _RTF_HEX_RE.sub('', plain_text)
+        # Remove stray numbers that belong to RTF commands
+        plain_text = _RTF_STRAY_NUM_RE.sub(' ', plain_text)
+
+    yield from _process_rtf_text(plain_text)
+
+
+def _format_rtf_line(line):
+    """Apply Markdown formatting to a cleaned, non-empty RTF text line."""
+    is_upper = line.isupper()
+    low = line.lower()
+    # Detect primary headings (uppercase, no trailing period, contains keywords)
+    if (is_upper and 15 < len(line) < 120 and
+        not line.endswith('.') and
+        ('TOMOGRAFIA' in line or 'ANGIO' in line or 'COMPUTADORIZADA' in line)):
+        return f"## {line}"
+    # Detect important sections
+    if any(keyword in low for keyword in _KEYWORDS):
+        # Uppercase text is a heading
+        if is_upper and len(line) > 10:
+            return f"## {line}"
+        # If it starts with a keyword, make it bold
+        if line.upper().startswith(_SECTION_STARTS):
+            return f"**{line}**"
+        return line
+    # Detect italic text (usually footnotes)
+    if any(word in low for word in _FOOTNOTE_WORDS):
+        return f"*{line}*"
+    return line
+
+
+def _process_rtf_text(plain_text):
+    """Clean, format and de-duplicate blank lines of extracted RTF text in one pass."""
+    prev_empty = False
+    for line in plain_text.split('\n'):
+        # Strip control characters
+        line = _CTRL_RE.sub('', line.strip()).strip()
         
-        for line in lines:
-            line = line.strip()
-            
-            # Strip control characters
-            line = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', line)
-            line = line.strip()
-            
-            # Drop lines that are only artifacts
-            if not line:
-                cleaned_lines.append("")
-                continue
-            
+        if line:
             # Remove lines that are only font names or RTF commands
-            if (line.lower() in ['times new roman', 'arial', 'calibri', 'helvetica', 
-                                 'trebuchet ms', 'cambria', 'times'] or
-                re.match(r'^[a-z\s]+\}?$', line.lower()) or
-                re.match(r'^[\d\s\-]+$', line) or
+            if (line.lower() in _FONT_NAMES or
+                _DISCARD_RE.match(line) or
                 line.count('}') > line.count(' ') or
                 (len(line) < 3 and not line.isalnum())):
                 continue
             
             # Remove RTF conversion artifacts
-            line = re.sub(r'\s+', ' ', line)  # Multiple spaces
-            line = re.sub(r'^[a-z]+\s+[a-z]+\s+', '', line)  # Remove stray words at start
-            line = re.sub(r'\s*\}\s*$', '', line)  # Remove braces at end
-            line = re.sub(r'^\s*\{\s*', '', line)  # Remove braces at start
-            
-            # Remove stray numbers at start/end
-            line = re.sub(r'^\s*[\d\-]+\s+', '', line)
-            line = re.sub(r'\s+[\d\-]+\s*$', '', line)
-            
-            if line.strip():
-                cleaned_lines.append(line.strip())
-        
-        # Process cleaned lines and apply formatting
-        markdown_lines = []
-        
-        for line in cleaned_lines:
+            line = _WS_RE.sub(' ', line)  # Multiple spaces
+            for pattern in _ARTIFACT_RES:
+                line = pattern.sub('', line)
+            line = line.strip()
             if not line:
-                markdown_lines.append("")
                 continue
-            
-            # Detect primary headings (uppercase, no trailing period, contains keywords)
-            if (line.isupper() and 15 < len(line) < 120 and 
-                not line.endswith('.') and 
-                ('TOMOGRAFIA' in line or 'ANGIO' in line or 'COMPUTADORIZADA' in line)):
-                markdown_lines.append(f"## {line}")
-            # Detect important sections
-            elif any(keyword in line.upper() for keyword in 
-                    ['INDICAÇÃO CLÍNICA', 'TÉCNICA DO EXAME', 'ASPECTOS OBSERVADOS', 'IMPRESSÃO']):
-                # Uppercase text is a heading
-                if line.isupper() and len(line) > 10:
-                    markdown_lines.append(f"## {line}")
-                else:
-                    # If it starts with a keyword, make it bold
-                    for keyword in ['INDICAÇÃO', 'TÉCNICA', 'ASPECTOS', 'IMPRESSÃO']:
-                        if line.upper().startswith(keyword):
-                            markdown_lines.append(f"**{line}**")
-                            break
-                    else:
-                        markdown_lines.append(line)
-            # Detect italic text (usually footnotes)
-            elif ('probabilidade' in line.lower() or 
-                  'médico' in line.lower() or 
-                  'diagnóstica' in line.lower()):
-                markdown_lines.append(f"*{line}*")
-            else:
-                markdown_lines.append(line)
         
-        # Remove excessive empty lines
-        result = []
-        prev_empty = False
-        for line in markdown_lines:
-            if not line.strip():
-                if not prev_empty:
-                    result.append("")
-                prev_empty = True
-            else:
-                result.append(line)
-                prev_empty = False
-        
-        return "\n".join(result)
-    
+        # Collapse runs of empty lines into one
+        if not line:
+            if not prev_empty:
+                yield ""
+            prev_empty = True
+        else:
+            yield _format_rtf_line(line)
+            prev_empty = False
+
+
+def _rtf_error(rtf_path, e):
+    # Must be called while handling e so the traceback is available.
+    import traceback
+    return f"# Error converting {rtf_path}\n\nError: {str(e)}\n\nTraceback: {traceback.format_exc()}"
+
+
+def convert_rtf_to_markdown(rtf_path):
+    """Convert an .rtf file to Markdown preserving basic formatting."""
+    try:
+        return "\n".join(iter_rtf_markdown(rtf_path))
     except Exception as e:
-        import traceback
-        return f"# Error converting {rtf_path}\n\nError: {str(e)}\n\nTraceback: {traceback.format_exc()}"
+        return _rtf_error(rtf_path, e)
+
+
+def write_markdown(output_file, lines, error_message):
+    """Stream lines to output_file joined by newlines, through a 64 KiB buffer.
+
+    If producing the lines fails, the file is rewritten with error_message(exc).
+    """
+    with open(output_file, 'w', encoding='utf-8', buffering=65536) as f:
+        try:
+            it = iter(lines)
+            first = next(it, None)
+            if first is not None:
+                f.write(first)
+                f.writelines("\n" + line for line in it)
+        except Exception as e:
+            f.seek(0)
+            f.truncate()
+            f.write(error_message(e))
+
+
+def _convert_docx(docx_file, out_dir):
+    """Convert one .docx file into out_dir and return the output path."""
+    output_file = out_dir / f"{docx_file.stem}.md"
+    write_markdown(output_file, iter_docx_markdown(docx_file), partial(_docx_error, docx_file))
+    return output_file
+
+
+def _convert_rtf(rtf_file, out_dir):
+    """Convert one .rtf file into out_dir and return the output path."""
+    output_file = out_dir / f"{rtf_file.stem}.md"
+    write_markdown(output_file, iter_rtf_markdown(rtf_file), partial(_rtf_error, rtf_file))
+    return output_file
 
 
 def main():
@@ -249,29 +302,26 @@ def main():
     markdown_dir = REPO_ROOT / "Templates_markdown"
     markdown_dir.mkdir(exist_ok=True)
     
-    # Process .docx files
     docx_files = list(reports_dir.glob("*.docx"))
-    print(f"Found {len(docx_files)} .docx files")
-    
-    for docx_file in docx_files:
-        print(f"Converting {docx_file.name}...")
-        markdown_content = convert_docx_to_markdown(docx_file)
-        output_file = markdown_dir / f"{docx_file.stem}.md"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
-        print(f"  ✓ Saved to {output_file.name}")
-    
-    # Process .rtf files
     rtf_files = list(reports_dir.glob("*.rtf"))
-    print(f"\nFound {len(rtf_files)} .rtf files")
     
-    for rtf_file in rtf_files:
-        print(f"Converting {rtf_file.name}...")
-        markdown_content = convert_rtf_to_markdown(rtf_file)
-        output_file = markdown_dir / f"{rtf_file.stem}.md"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
-        print(f"  ✓ Saved to {output_file.name}")
+    # python-docx and striprtf are pure Python (GIL-bound), so convert in processes.
+    # The .rtf batch starts after every .docx is written, so an .rtf still wins
+    # when both share a stem.
+    with ProcessPoolExecutor() as executor:
+        # Process .docx files
+        print(f"Found {len(docx_files)} .docx files")
+        outputs = executor.map(partial(_convert_docx, out_dir=markdown_dir), docx_files, chunksize=2)
+        for docx_file, output_file in zip(docx_files, outputs):
+            print(f"Converted {docx_file.name}")
+            print(f"  ✓ Saved to {output_file.name}")
+        
+        # Process .rtf files
+        print(f"\nFound {len(rtf_files)} .rtf files")
+        outputs = executor.map(partial(_convert_rtf, out_dir=markdown_dir), rtf_files, chunksize=2)
+        for rtf_file, output_file in zip(rtf_files, outputs):
+            print(f"Converted {rtf_file.name}")
+            print(f"  ✓ Saved to {output_file.name}")
     
     print(f"\n✓ Conversion finished! Files saved to {markdown_dir}")
 
@@ -7,13 +7,18 @@ Convert .txt files to Markdown applying formatting rules:
 """
 
 import argparse
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Iterable, List, Optional, Union
+
+from python_src.fs_utils import iter_ext
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 TXT_DIR = REPO_ROOT / "Templates_txt"
 MD_DIR = REPO_ROOT / "Templates_markdown"
+DEFAULT_PARALLEL = 5
 
 SECTION_PREFIXES = [
     "técnica do exame:",
@@ -23,75 +28,99 @@ SECTION_PREFIXES = [
     "indicação clínica:",
     "indicação:",
 ]
+# All prefixes in one case-insensitive alternation, anchored by match(), so a
+# line is lowered by the regex engine rather than copied with casefold().
+_SECTION_RE = re.compile("|".join(map(re.escape, SECTION_PREFIXES)), re.IGNORECASE)
 
 
-def find_first_last_nonempty(lines: List[str]) -> Optional[tuple[int, int]]:
-    """Return indices of first and last non-empty lines, or None if all empty."""
-    nonempty_indices = [i for i, line in enumerate(lines) if line.strip()]
-    if not nonempty_indices:
-        return None
-    return nonempty_indices[0], nonempty_indices[-1]
+def _is_section_heading(text: str) -> bool:
+    """should_bold_section for a line that is already stripped."""
+    if _SECTION_RE.match(text):
+        return True
+    # Generic heuristic: short line ending with ':' looks like a heading.
+    return text.endswith(":") and len(text) <= 120
 
 
 def should_bold_section(line: str) -> bool:
     """Decide if a line should be bolded as a section heading."""
-    lowered = line.casefold().strip()
-    if any(lowered.startswith(prefix) for prefix in SECTION_PREFIXES):
-        return True
-    # Generic heuristic: short line ending with ':' looks like a heading.
-    if lowered.endswith(":") and len(lowered) <= 120:
-        return True
-    return False
+    return _is_section_heading(line.strip())
 
 
 def format_lines_as_markdown(lines: Iterable[str]) -> List[str]:
     """Apply formatting rules to raw text lines."""
-    line_list = list(lines)
-    first_last = find_first_last_nonempty(line_list)
-    first_idx = last_idx = None
-    if first_last is not None:
-        first_idx, last_idx = first_last
-
     output: List[str] = []
-    for idx, line in enumerate(line_list):
+    first_seen = False
+    last_out_pos: Optional[int] = None
+    last_text = ""
+    for line in lines:
         stripped = line.strip()
         if not stripped:
             output.append("")
             continue
 
-        is_first = first_idx is not None and idx == first_idx
-        is_last = last_idx is not None and idx == last_idx
-
-        text = stripped
-        if is_last:
-            text = f"*{text}*"
-        elif is_first or should_bold_section(stripped):
-            text = f"**{text}**"
+        # Each line is stripped exactly once; the helpers reuse that copy.
+        if not first_seen or _is_section_heading(stripped):
+            first_seen = True
+            text = f"**{stripped}**"
+        else:
+            text = stripped
 
+        last_out_pos = len(output)
+        last_text = stripped
         output.append(text)
 
+    # The last non-empty line is only known once the input is exhausted;
+    # it is italic even when it is also the first line or a section heading.
+    if last_out_pos is not None:
+        output[last_out_pos] = f"*{last_text}*"
+
     return output
 
 
-def convert_txt_file(txt_path: Path, output_dir: Path) -> None:
-    """Convert a single .txt file to Markdown."""
+def convert_txt_file(txt_path: Union[str, Path], output_dir: Path) -> Path:
+    """Convert a single .txt file to Markdown and return the output path.
+
+    output_dir must exist.
+    """
+    txt_path = Path(txt_path)
     lines = txt_path.read_text(encoding="utf-8").splitlines()
     formatted = format_lines_as_markdown(lines)
-    output_dir.mkdir(parents=True, exist_ok=True)
     md_path = output_dir / f"{txt_path.stem}.md"
-    md_path.write_text("\n".join(formatted), encoding="utf-8")
-    print(f"✓ {txt_path.name} -> {md_path.name}")
-
-
-def convert_folder(txt_dir: Path, output_dir: Path) -> None:
-    """Convert all .txt files in a folder to Markdown."""
-    txt_files = sorted(txt_dir.glob("*.txt"))
+    # Write pre-encoded lines with separators between them (no trailing newline),
+    # skipping the joined copy of the whole document.
+    with open(md_path, "wb", buffering=65536) as f:
+        it = iter(formatted)
+        first = next(it, None)
+        if first is not None:
+            f.write(first.encode("utf-8"))
+            f.writelines(b"\n" + line.encode("utf-8") for line in it)
+    return md_path
+
+
+def convert_folder(
+    txt_dir: Path, output_dir: Path, parallel: int = DEFAULT_PARALLEL
+) -> None:
+    """Convert all .txt files in a folder to Markdown, `parallel` files at a time."""
+    # Output order does not matter here, so skip sorting the listing.
+    txt_files = list(iter_ext(txt_dir, ".txt"))
     if not txt_files:
         print(f"No .txt files found in {txt_dir}")
         return
 
-    for txt_file in txt_files:
-        convert_txt_file(txt_file, output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # Small files, dominated by file I/O (which releases the GIL): threads suffice.
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        md_paths = executor.map(lambda p: convert_txt_file(p, output_dir), txt_files)
+        for txt_file, md_path in zip(txt_files, md_paths):
+            print(f"✓ {Path(txt_file).name} -> {md_path.name}")
+
+
+def positive_int(value: str) -> int:
+    """argparse type for --parallel: an integer of at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
 def parse_args(argv=None) -> argparse.Namespace:
@@ -110,6 +139,13 @@ def parse_args(argv=None) -> argparse.Namespace:
         default=MD_DIR,
         help="Destination folder for .md files (default: Templates_markdown).",
     )
+    parser.add_argument(
+        "--parallel",
+        type=positive_int,
+        default=DEFAULT_PARALLEL,
+        metavar="N",
+        help=f"Number of files converted concurrently (default: {DEFAULT_PARALLEL}).",
+    )
     return parser.parse_args(argv)
 
 
@@ -119,7 +155,7 @@ def main(argv=None) -> None:
     if not args.txt_dir.exists():
         raise SystemExit(f"Source folder not found: {args.txt_dir}")
 
-    convert_folder(args.txt_dir, args.output_dir)
+    convert_folder(args.txt_dir, args.output_dir, args.parallel)
     print(f"\n✓ Markdown generated in {args.output_dir}")
 
 
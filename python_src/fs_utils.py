@@ -0,0 +1,26 @@
+"""
+Filesystem helpers shared by the converters.
+"""
+
+import os
+from pathlib import Path
+from typing import Iterator, Union
+
+
+def iter_ext(
+    directory: Union[str, bytes, Path], ext: Union[str, bytes]
+) -> Iterator[Union[str, bytes]]:
+    """
+    Yield the paths of files in directory whose name ends with ext.
+
+    Paths are str, or bytes (undecoded) when directory and ext are bytes.
+    Non-recursive and unordered. DirEntry caches the file type from the directory
+    listing, so regular files need no extra stat. A missing directory yields nothing.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(ext) and entry.is_file():
+                    yield entry.path
+    except FileNotFoundError:
+        return
@@ -2,50 +2,169 @@
 """
 Build an index of report files in Templates_docx, Templates_markdown, and Templates_txt.
 The index is written to reports_index.json in the repo root.
+
+Folder metadata is cached in reports_index.meta.json; when no folder changed
+since the last run the existing index is kept as is (use --force to rebuild).
 """
 
+import argparse
 import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from python_src.fs_utils import iter_ext
+
+try:
+    import orjson
+except ImportError:  # optional, faster JSON encoding/decoding
+    orjson = None
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
+# Folder name -> file suffix to index.
 TARGETS = {
-    "Templates_docx": "*.docx",
-    "Templates_markdown": "*.md",
-    "Templates_txt": "*.txt",
+    "Templates_docx": ".docx",
+    "Templates_markdown": ".md",
+    "Templates_txt": ".txt",
 }
 INDEX_PATH = REPO_ROOT / "reports_index.json"
+META_PATH = REPO_ROOT / "reports_index.meta.json"
+
+
+def folder_meta() -> Dict[str, Optional[List[int]]]:
+    """Return [dir mtime_ns, dir inode] per folder (None if missing).
+
+    Adding, removing or renaming an entry updates the directory mtime, so this
+    changes whenever the indexed file names can have changed.
+    """
+    meta: Dict[str, Optional[List[int]]] = {}
+    for folder_name in TARGETS:
+        try:
+            st = os.stat(REPO_ROOT / folder_name)
+        except FileNotFoundError:
+            meta[folder_name] = None
+        else:
+            meta[folder_name] = [st.st_mtime_ns, st.st_ino]
+    return meta
+
+
+def index_is_current(meta: Dict[str, Optional[List[int]]]) -> bool:
+    """Whether reports_index.json was built from folders matching meta."""
+    try:
+        cached = json.loads(META_PATH.read_text(encoding="utf-8"))
+        index = load_index_file()
+        for folder_name, current in meta.items():
+            entry = cached[folder_name]
+            if current is None:
+                if entry is not None:
+                    return False
+            # The count catches an index edited or replaced since it was written
+            elif entry is None or entry[:2] != current or entry[2] != len(index[folder_name]):
+                return False
+    except (OSError, ValueError, KeyError, IndexError, TypeError):
+        # Missing or corrupt cache/index: rebuild
+        return False
+    return True
+
+
+def _scan_folder(target: Tuple[str, str]) -> Tuple[str, Optional[List[str]]]:
+    """Return (folder name, sorted repo-relative paths), or None if the folder is missing."""
+    folder_name, suffix = target
+    folder = REPO_ROOT / folder_name
+    if not folder.exists():
+        return folder_name, None
+    # Listed paths all start with the repo root, so slicing it off is enough to
+    # make them relative (no per-path relative_to parsing).
+    root_len = len(str(REPO_ROOT) + os.sep)
+    return folder_name, sorted(path[root_len:] for path in iter_ext(folder, suffix))
 
 
 def collect_index() -> Dict[str, List[str]]:
     """Collect file paths per folder, relative to repo root."""
     index: Dict[str, List[str]] = {}
-    for folder_name, pattern in TARGETS.items():
-        folder = REPO_ROOT / folder_name
-        if not folder.exists():
-            print(f"Skipping missing folder: {folder}")
-            index[folder_name] = []
-            continue
-
-        files = sorted(
-            str(path.relative_to(REPO_ROOT))
-            for path in folder.glob(pattern)
-            if path.is_file()
-        )
-        index[folder_name] = files
-        print(f"{folder_name}: {len(files)} files")
+    # The folder scans are independent and syscall-bound, so overlap them;
+    # map() keeps TARGETS order for the index and the progress output.
+    with ThreadPoolExecutor(max_workers=len(TARGETS)) as executor:
+        for folder_name, files in executor.map(_scan_folder, TARGETS.items()):
+            if files is None:
+                print(f"Skipping missing folder: {REPO_ROOT / folder_name}")
+                files = []
+            else:
+                print(f"{folder_name}: {len(files)} files")
+            index[folder_name] = files
 
     return index
 
 
-def main() -> None:
+def load_index_file():
+    """Decode reports_index.json (raises OSError/ValueError if missing or invalid)."""
+    raw = INDEX_PATH.read_bytes()
+    # orjson.JSONDecodeError subclasses ValueError, like json's
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def write_index(index: Dict[str, List[str]]) -> None:
+    """Write index to reports_index.json (2-space indent, non-ASCII kept as UTF-8)."""
+    if orjson is not None:
+        # Byte-identical to the json.dumps call below, encoded straight to UTF-8
+        data = orjson.dumps(index, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(index, indent=2, ensure_ascii=False).encode("utf-8")
+    INDEX_PATH.write_bytes(data)
+
+
+def update_index(produced: Dict[str, Iterable[str]]) -> None:
+    """Add files a tool just wrote to reports_index.json without rescanning.
+
+    produced maps folder names to repo-relative paths; existing entries are kept.
+    Without a readable index, a full one is built instead.
+    """
+    try:
+        current = load_index_file()
+        index = {
+            folder_name: sorted(
+                set(current.get(folder_name, [])).union(produced.get(folder_name, ()))
+            )
+            for folder_name in TARGETS
+        }
+    except (OSError, ValueError, AttributeError, TypeError):
+        index = collect_index()
+    write_index(index)
+    print(f"Index updated: {INDEX_PATH}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build reports_index.json.")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild the index even if the folders look unchanged.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+
+    # Stat before scanning so a change made during the scan invalidates the cache
+    meta = folder_meta()
+    if not args.force and index_is_current(meta):
+        print(f"Folders unchanged; {INDEX_PATH} is up to date (use --force to rebuild)")
+        return
+
     index = collect_index()
-    INDEX_PATH.write_text(
-        json.dumps(index, indent=2, ensure_ascii=False),
+    write_index(index)
+    META_PATH.write_text(
+        json.dumps({
+            name: None if m is None else m + [len(index[name])]
+            for name, m in meta.items()
+        }),
         encoding="utf-8",
     )
     print(f"\nIndex written to {INDEX_PATH}")
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
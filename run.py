@@ -5,15 +5,27 @@ Unified CLI entry point for the Python tools.
 Usage:
   python run.py convert_to_docx
   python run.py convert_to_markdown
-  python run.py convert_to_txt [--from-docx]
-  python run.py convert_txt_to_markdown [--txt-dir DIR] [--output-dir DIR]
-  python run.py generate_index
+  python run.py convert_to_txt [--from-docx] [--parallel N] [--update-index]
+  python run.py convert_txt_to_markdown [--txt-dir DIR] [--output-dir DIR] [--parallel N]
+  python run.py generate_index [--force]
   python run.py backup
 """
 
 import argparse
+import importlib
 import sys
-from typing import List
+from typing import Dict, List, Tuple
+
+# Command -> (module whose main() runs it, whether main() takes the tool's argv).
+# Modules are imported only when their command runs.
+COMMANDS: Dict[str, Tuple[str, bool]] = {
+    "convert_to_docx": ("python_src.convert_to_docx", False),
+    "convert_to_markdown": ("python_src.convert_to_markdown", False),
+    "convert_to_txt": ("python_src.convert_to_txt", True),
+    "convert_txt_to_markdown": ("python_src.convert_txt_to_markdown", True),
+    "generate_index": ("python_src.generate_index", True),
+    "backup": ("python_src.backup", False),
+}
 
 
 def dispatch(argv: List[str]) -> int:
@@ -23,54 +35,40 @@ def dispatch(argv: List[str]) -> int:
     sub.add_parser("convert_to_docx", help="Markdown -> DOCX")
     sub.add_parser("convert_to_markdown", help="DOCX/RTF -> Markdown")
 
-    to_txt = sub.add_parser("convert_to_txt", help="Markdown (or DOCX via temp) -> TXT")
+    to_txt = sub.add_parser("convert_to_txt", help="Markdown (or DOCX) -> TXT")
     to_txt.add_argument(
         "--from-docx",
         action="store_true",
         help="Convert DOCX -> Markdown -> TXT",
     )
+    to_txt.add_argument("--parallel", type=int, default=None, help="Files converted concurrently")
+    to_txt.add_argument(
+        "--update-index",
+        action="store_true",
+        help="Add generated TXT files to reports_index.json",
+    )
 
     txt_to_md = sub.add_parser("convert_txt_to_markdown", help="TXT -> Markdown")
     txt_to_md.add_argument("--txt-dir", type=str, default=None, help="TXT source dir")
     txt_to_md.add_argument("--output-dir", type=str, default=None, help="Markdown output dir")
+    txt_to_md.add_argument("--parallel", type=int, default=None, help="Files converted concurrently")
 
-    sub.add_parser("generate_index", help="Build reports_index.json")
+    gen_index = sub.add_parser("generate_index", help="Build reports_index.json")
+    gen_index.add_argument("--force", action="store_true", help="Rebuild even if unchanged")
     sub.add_parser("backup", help="Move unindexed files to backup/")
 
-    args, rest = parser.parse_known_args(argv)
+    args, _ = parser.parse_known_args(argv)
+    # The subcommand options above only serve --help and validation; tools that
+    # take arguments re-parse everything after the command name themselves.
+    tool_argv = argv[1:]
 
-    if args.command == "convert_to_docx":
-        from python_src.convert_to_docx import main as cmd
+    module_name, takes_argv = COMMANDS[args.command]
+    cmd = importlib.import_module(module_name).main
+    if takes_argv:
+        cmd(tool_argv)
+    else:
         cmd()
-        return 0
-
-    if args.command == "convert_to_markdown":
-        from python_src.convert_to_markdown import main as cmd
-        cmd()
-        return 0
-
-    if args.command == "convert_to_txt":
-        from python_src.convert_to_txt import main as cmd
-        cmd(rest)
-        return 0
-
-    if args.command == "convert_txt_to_markdown":
-        from python_src.convert_txt_to_markdown import main as cmd
-        cmd(rest)
-        return 0
-
-    if args.command == "generate_index":
-        from python_src.generate_index import main as cmd
-        cmd()
-        return 0
-
-    if args.command == "backup":
-        from python_src.backup import main as cmd
-        cmd()
-        return 0
-
-    parser.error(f"Unknown command {args.command}")
-    return 1
+    return 0
 
 
 if __name__ == "__main__":